@@ -1,19 +1,27 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+import logging
+import multiprocessing
 from typing import Optional
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from .config import settings
-from .db import get_database
 from .schemas import AdminInToken
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/admin/login")
 
+logger = logging.getLogger("uvicorn.error")
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -23,6 +31,55 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class HashPool:
+    executor: ProcessPoolExecutor | None = None
+
+
+hash_pool = HashPool()
+
+
+def start_hash_pool() -> None:
+    """Start the process pool used for bcrypt. Called once at application startup."""
+    # spawn rather than fork: the server process already runs driver threads
+    hash_pool.executor = ProcessPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing process pool. Called once at application shutdown."""
+    if hash_pool.executor is not None:
+        hash_pool.executor.shutdown()
+    hash_pool.executor = None
+
+
+async def _run_in_hash_pool(func, *args):
+    """Run a hashing call in the process pool, or in a thread before startup or after a crash."""
+    executor = hash_pool.executor
+    if executor is None:
+        return await asyncio.to_thread(func, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # A crashed child leaves the executor unusable for good; replace it once and
+        # answer this call from a thread so the request still succeeds
+        if hash_pool.executor is executor:
+            logger.warning("Password hashing pool broke; starting a new one")
+            executor.shutdown(wait=False)
+            start_hash_pool()
+        return await asyncio.to_thread(func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash off the event loop, in the process pool when it is running."""
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -44,13 +101,15 @@ async def get_current_admin(token: str = Depends(oauth2_scheme)) -> AdminInToken
         org_name: str | None = payload.get("org_name")
         if admin_id is None or org_id is None or org_name is None:
             raise credentials_exception
-    except JWTError:
+        admin_oid = ObjectId(admin_id)
+        org_oid = ObjectId(org_id)
+    except (JWTError, InvalidId, TypeError):
         raise credentials_exception
 
-    return AdminInToken(admin_id=admin_id, organization_id=org_id, organization_name=org_name)
-
-
-async def get_master_collections():
-    """Helper dependency to get master collections: organizations and admins."""
-    db = await get_database()
-    return db["organizations"], db["admins"]
+    return AdminInToken(
+        admin_id=admin_id,
+        organization_id=org_id,
+        organization_name=org_name,
+        admin_oid=admin_oid,
+        organization_oid=org_oid,
+    )
@@ -1,16 +1,41 @@
+from dataclasses import dataclass
 import os
 
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Application settings loaded from environment variables."""
+    """Application settings loaded from environment variables once, at import time."""
 
     PROJECT_NAME: str = "Organization Management Service"
     MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "org_service")
 
+    # Connection pool tuning for the Motor client. Each uvicorn worker process has its own
+    # pool, so the connection budget is split across workers unless sized explicitly.
+    # WEB_CONCURRENCY is what uvicorn itself uses as the default for --workers.
+    UVICORN_WORKERS: int = max(1, int(os.getenv("UVICORN_WORKERS") or os.getenv("WEB_CONCURRENCY") or "1"))
+    MONGODB_TOTAL_POOL_SIZE: int = int(os.getenv("MONGODB_TOTAL_POOL_SIZE", "200"))
+    MONGODB_MAX_POOL_SIZE: int = int(
+        os.getenv("MONGODB_MAX_POOL_SIZE", str(max(10, MONGODB_TOTAL_POOL_SIZE // UVICORN_WORKERS)))
+    )
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "5"))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "30000"))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "3000"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "change_me_in_production")
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+    # Password hashing cost and the size of the per-worker hashing process pool
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // UVICORN_WORKERS)))
+    )
+
 
 settings = Settings()
+
+# Bound once so the connection setup reads plain module globals
+MONGODB_URI = settings.MONGODB_URI
+MONGODB_DB_NAME = settings.MONGODB_DB_NAME
@@ -1,16 +1,30 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from .config import settings
+import asyncio
 
+from fastapi import Request
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from .config import MONGODB_URI, settings
 
-class Database:
-    client: AsyncIOMotorClient | None = None
 
+def create_client() -> AsyncIOMotorClient:
+    """Create a Motor client bound to the running event loop with an explicitly sized pool."""
+    return AsyncIOMotorClient(
+        MONGODB_URI,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+        serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        retryWrites=True,
+        uuidRepresentation="standard",
+        io_loop=asyncio.get_running_loop(),
+    )
 
-db_instance = Database()
 
+def get_orgs_collection(request: Request) -> AsyncIOMotorCollection:
+    """Dependency returning the master `organizations` collection."""
+    return request.app.state.orgs
 
-async def get_database():
-    """Return the main MongoDB database handle."""
-    if db_instance.client is None:
-        db_instance.client = AsyncIOMotorClient(settings.MONGODB_URI)
-    return db_instance.client[settings.MONGODB_DB_NAME]
+
+def get_admins_collection(request: Request) -> AsyncIOMotorCollection:
+    """Dependency returning the master `admins` collection."""
+    return request.app.state.admins
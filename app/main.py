@@ -1,10 +1,43 @@
+from contextlib import asynccontextmanager
+import logging
+
 from fastapi import FastAPI
 
-from .config import settings
+from .auth import shutdown_hash_pool, start_hash_pool
+from .config import MONGODB_DB_NAME, settings
+from .db import create_client
 from .routers import org, admin
 
 
-app = FastAPI(title=settings.PROJECT_NAME)
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(
+        "MongoDB pool: maxPoolSize=%d per worker (%d workers)",
+        settings.MONGODB_MAX_POOL_SIZE,
+        settings.UVICORN_WORKERS,
+    )
+    start_hash_pool()
+    try:
+        # Build the Mongo client and master collection handles once, before the first request
+        app.state.mongo = create_client()
+        try:
+            db = app.state.mongo[MONGODB_DB_NAME]
+            app.state.orgs = db["organizations"]
+            app.state.admins = db["admins"]
+            # Uniqueness is enforced by the server, so create/rename need no pre-check query
+            await app.state.orgs.create_index("slug", unique=True)
+            await app.state.admins.create_index("email", unique=True)
+            yield
+        finally:
+            app.state.mongo.close()
+    finally:
+        shutdown_hash_pool()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 
 @app.get("/")
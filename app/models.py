@@ -1,135 +1,257 @@
+import asyncio
 from datetime import datetime
+import logging
 import re
 from typing import Optional
 
+from async_lru import alru_cache
 from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError, OperationFailure
 
-from .auth import hash_password
-from .db import get_database
+from .auth import hash_password_async
+
+logger = logging.getLogger("uvicorn.error")
+
+# Organization fields needed by the handlers; keeps lookups from pulling whole documents
+ORG_PROJECTION = {"id_str": 1, "name": 1, "slug": 1, "collection_name": 1, "admin_id": 1, "created_at": 1, "updated_at": 1}
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Fallback rename copy: documents fetched per getMore and written per insert_many
+_COPY_FETCH_BATCH_SIZE = 1000
+_COPY_INSERT_BATCH_SIZE = 500
 
 
 def slugify(name: str) -> str:
     """Very simple slugify: lowercases and replaces non-alphanumerics with underscores."""
     name = name.strip().lower()
-    name = re.sub(r"[^a-z0-9]+", "_", name)
+    name = _SLUG_RE.sub("_", name)
     return name.strip("_")
 
 
-async def get_org_by_name(organization_name: str) -> Optional[dict]:
-    db = await get_database()
-    orgs = db["organizations"]
+@alru_cache(maxsize=1024, ttl=30)
+async def _fetch_org_by_slug(orgs: AsyncIOMotorCollection, slug: str) -> Optional[dict]:
+    """Cached organization lookup; entries are invalidated on create, rename and delete."""
+    return await orgs.find_one({"slug": slug}, projection=ORG_PROJECTION)
+
+
+async def get_org_by_name(orgs: AsyncIOMotorCollection, organization_name: str) -> Optional[dict]:
     slug = slugify(organization_name)
-    return await orgs.find_one({"slug": slug})
+    return await _fetch_org_by_slug(orgs, slug)
 
 
-async def create_organization_with_admin(organization_name: str, email: str, password: str) -> dict:
-    db = await get_database()
-    orgs = db["organizations"]
-    admins = db["admins"]
+async def _copy_collection(db, source_name: str, target_name: str) -> None:
+    """Copy every document from one collection into another, server-side when possible."""
+    try:
+        await db[source_name].aggregate([{"$out": target_name}]).to_list(length=None)
+        return
+    except OperationFailure:
+        # $out can be refused (e.g. restricted privileges); fall back to a batched copy
+        pass
+
+    # Start from an empty target, like $out, so a retried copy doesn't hit duplicate _ids
+    await db.drop_collection(target_name)
+    target = db[target_name]
+    buffer: list = []
+    async for doc in db[source_name].find({}, batch_size=_COPY_FETCH_BATCH_SIZE):
+        buffer.append(doc)
+        if len(buffer) >= _COPY_INSERT_BATCH_SIZE:
+            await target.insert_many(buffer, ordered=False)
+            buffer = []
+    if buffer:
+        await target.insert_many(buffer, ordered=False)
+
+
+async def _move_collection(db, source_name: str, target_name: str) -> None:
+    await _copy_collection(db, source_name, target_name)
+    await db.drop_collection(source_name)
+
+
+async def _undo_update(
+    orgs: AsyncIOMotorCollection,
+    admins: AsyncIOMotorCollection,
+    current_org: dict,
+    update_fields: dict,
+    previous_admin: Optional[dict],
+) -> None:
+    """Put back the org and admin fields written by update_organization_and_admin.
+
+    Failures are logged rather than raised so the caller can re-raise the original error.
+    """
+    if update_fields:
+        previous_org_fields = {key: current_org[key] for key in update_fields}
+        try:
+            await orgs.update_one({"_id": current_org["_id"]}, {"$set": previous_org_fields})
+        except Exception:
+            logger.exception("Could not restore organization %s after a failed update", current_org["_id"])
+        # Both names may have been looked up (and cached) while the rename was live
+        _fetch_org_by_slug.cache_invalidate(orgs, current_org["slug"])
+        _fetch_org_by_slug.cache_invalidate(orgs, update_fields["slug"])
+    if previous_admin:
+        restore = {key: value for key, value in previous_admin.items() if key != "_id"}
+        if restore:
+            try:
+                await admins.update_one({"_id": current_org["admin_id"]}, {"$set": restore})
+            except Exception:
+                logger.exception("Could not restore admin %s after a failed update", current_org["admin_id"])
 
-    slug = slugify(organization_name)
-    existing = await orgs.find_one({"slug": slug})
-    if existing:
-        raise ValueError("Organization with this name already exists")
 
+async def create_organization_with_admin(
+    orgs: AsyncIOMotorCollection,
+    admins: AsyncIOMotorCollection,
+    organization_name: str,
+    email: str,
+    password: str,
+) -> dict:
+    slug = slugify(organization_name)
     now = datetime.utcnow()
     collection_name = f"org_{slug}"
 
-    # Create admin user
+    # Pre-generate both ids so admin and org are written with their cross-references
+    admin_id = ObjectId()
+    org_id = ObjectId()
+
     admin_doc = {
+        "_id": admin_id,
         "email": email,
-        "password_hash": hash_password(password),
+        "password_hash": await hash_password_async(password),
+        "organization_id": org_id,
         "created_at": now,
     }
-    admin_result = await admins.insert_one(admin_doc)
-
-    # Create organization metadata
     org_doc = {
+        "_id": org_id,
+        # Hex id stored alongside so responses don't stringify the ObjectId each time
+        "id_str": str(org_id),
         "name": organization_name,
         "slug": slug,
         "collection_name": collection_name,
         "created_at": now,
         "updated_at": now,
-        "admin_id": admin_result.inserted_id,
+        "admin_id": admin_id,
     }
-    org_result = await orgs.insert_one(org_doc)
 
-    # Link admin to org
-    await admins.update_one(
-        {"_id": admin_result.inserted_id},
-        {"$set": {"organization_id": org_result.inserted_id}},
-    }
+    # Both inserts are independent; the unique indexes reject duplicate slugs and emails
+    results = await asyncio.gather(
+        admins.insert_one(admin_doc),
+        orgs.insert_one(org_doc),
+        return_exceptions=True,
+    )
+    admin_error, org_error = (r if isinstance(r, BaseException) else None for r in results)
+    if admin_error or org_error:
+        # Roll back whichever insert went through so no admin or org is left dangling
+        if admin_error is None:
+            await admins.delete_one({"_id": admin_id})
+        if org_error is None:
+            await orgs.delete_one({"_id": org_id})
+            # A concurrent lookup may have cached the org before it was rolled back
+            _fetch_org_by_slug.cache_invalidate(orgs, slug)
+        if isinstance(org_error, DuplicateKeyError):
+            raise ValueError("Organization with this name already exists") from org_error
+        if isinstance(admin_error, DuplicateKeyError):
+            raise ValueError("Admin with this email already exists") from admin_error
+        raise admin_error or org_error
 
-    # Create the dynamic collection (empty but explicitly created)
-    await db.create_collection(collection_name)
+    # Drop a cached "not found" for this name
+    _fetch_org_by_slug.cache_invalidate(orgs, slug)
 
-    org_doc["_id"] = org_result.inserted_id
+    # The dynamic collection is created by MongoDB on its first write
     return org_doc
 
 
 async def update_organization_and_admin(
+    orgs: AsyncIOMotorCollection,
+    admins: AsyncIOMotorCollection,
     current_org: dict,
     new_org_name: Optional[str] = None,
     new_email: Optional[str] = None,
     new_password: Optional[str] = None,
 ) -> dict:
-    db = await get_database()
-    orgs = db["organizations"]
-    admins = db["admins"]
+    db = orgs.database
 
     update_fields: dict = {}
     old_collection_name = current_org["collection_name"]
 
     if new_org_name and new_org_name != current_org["name"]:
         new_slug = slugify(new_org_name)
-        existing = await orgs.find_one({"slug": new_slug})
-        if existing and existing["_id"] != current_org["_id"]:
-            raise ValueError("Organization name already in use")
-
-        new_collection_name = f"org_{new_slug}"
-
-        # Create new collection and sync data
-        old_collection = db[old_collection_name]
-        new_collection = db[new_collection_name]
-
-        async for doc in old_collection.find({}):
-            _id = doc.pop("_id", None)
-            await new_collection.insert_one(doc)
-
-        # Drop old collection
-        await db.drop_collection(old_collection_name)
-
         update_fields.update({
             "name": new_org_name,
             "slug": new_slug,
-            "collection_name": new_collection_name,
+            "collection_name": f"org_{new_slug}",
         })
 
-    if new_email or new_password:
-        admin_id = current_org["admin_id"]
-        admin_update: dict = {}
-        if new_email:
-            admin_update["email"] = new_email
-        if new_password:
-            admin_update["password_hash"] = hash_password(new_password)
-        if admin_update:
-            await admins.update_one({"_id": admin_id}, {"$set": admin_update})
+    admin_update: dict = {}
+    if new_email:
+        admin_update["email"] = new_email
+    if new_password:
+        admin_update["password_hash"] = await hash_password_async(new_password)
 
+    writes: dict = {}
     if update_fields:
         update_fields["updated_at"] = datetime.utcnow()
-        await orgs.update_one({"_id": current_org["_id"]}, {"$set": update_fields})
+        # The unique index on slug rejects names already used by another organization
+        writes["org"] = orgs.update_one({"_id": current_org["_id"]}, {"$set": update_fields})
+    if admin_update:
+        # Fetch the previous values in the same round-trip so the change can be undone
+        writes["admin"] = admins.find_one_and_update(
+            {"_id": current_org["admin_id"]},
+            {"$set": admin_update},
+            projection=dict.fromkeys(admin_update, 1),
+        )
+
+    # The org and admin writes are independent; run them together and roll back on failure
+    results = dict(zip(writes, await asyncio.gather(*writes.values(), return_exceptions=True)))
+    errors = {name: result for name, result in results.items() if isinstance(result, BaseException)}
+    if errors:
+        # Undo whichever write went through
+        await _undo_update(
+            orgs,
+            admins,
+            current_org,
+            update_fields if "org" not in errors else {},
+            results.get("admin") if "admin" not in errors else None,
+        )
+        if isinstance(errors.get("org"), DuplicateKeyError):
+            raise ValueError("Organization name already in use") from errors["org"]
+        if isinstance(errors.get("admin"), DuplicateKeyError):
+            raise ValueError("Admin with this email already exists") from errors["admin"]
+        raise next(iter(errors.values()))
+
+    if update_fields:
+        # Data is only moved once every metadata write has been accepted
+        new_collection_name = update_fields["collection_name"]
+        if new_collection_name != old_collection_name:
+            try:
+                await _move_collection(db, old_collection_name, new_collection_name)
+            except Exception:
+                # Point the org back at its data so the rename can simply be retried
+                await _undo_update(orgs, admins, current_org, update_fields, results.get("admin"))
+                raise
+
+        _fetch_org_by_slug.cache_invalidate(orgs, current_org["slug"])
+        _fetch_org_by_slug.cache_invalidate(orgs, update_fields["slug"])
         current_org.update(update_fields)
 
     return current_org
 
 
-async def delete_organization_and_admin(org: dict) -> None:
-    db = await get_database()
-    orgs = db["organizations"]
-    admins = db["admins"]
+async def delete_organization_and_admin(
+    orgs: AsyncIOMotorCollection,
+    admins: AsyncIOMotorCollection,
+    org: dict,
+) -> None:
+    db = orgs.database
 
-    await orgs.delete_one({"_id": org["_id"]})
-    await admins.delete_one({"_id": org["admin_id"]})
+    # Metadata, admin and org-specific collection are removed independently
+    results = await asyncio.gather(
+        orgs.delete_one({"_id": org["_id"]}),
+        admins.delete_one({"_id": org["admin_id"]}),
+        db.drop_collection(org["collection_name"]),
+        return_exceptions=True,
+    )
 
-    # Drop org-specific collection
-    await db.drop_collection(org["collection_name"])
+    # The org delete may have gone through even if another step failed
+    _fetch_org_by_slug.cache_invalidate(orgs, org["slug"])
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -1,40 +1,61 @@
-from bson import ObjectId
-from fastapi import APIRouter, HTTPException, status
+import asyncio
 
-from ..auth import create_access_token, verify_password
-from ..db import get_database
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+
+from ..auth import create_access_token, verify_password_async
+from ..db import get_admins_collection, get_orgs_collection
 from ..schemas import AdminLoginRequest, TokenResponse
+from .body import json_body_openapi, parse_json_body
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+_LOGIN_ADAPTER = TypeAdapter(AdminLoginRequest)
+
 
-@router.post("/login", response_model=TokenResponse)
-async def admin_login(payload: AdminLoginRequest):
+@router.post("/login", response_model=TokenResponse, openapi_extra=json_body_openapi(AdminLoginRequest))
+async def admin_login(
+    request: Request,
+    admins_coll=Depends(get_admins_collection),
+    orgs_coll=Depends(get_orgs_collection),
+):
     """Admin login endpoint.
 
     Validates credentials and returns a JWT containing admin and organization identifiers.
     """
+    payload = await parse_json_body(request, _LOGIN_ADAPTER)
 
-    db = await get_database()
-    admins_coll = db["admins"]
-    orgs_coll = db["organizations"]
-
-    admin = await admins_coll.find_one({"email": payload.email})
-    if not admin or not verify_password(payload.password, admin["password_hash"]):
+    admin = await admins_coll.find_one(
+        {"email": payload.email},
+        projection={"password_hash": 1, "organization_id": 1},
+    )
+    if not admin:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
+    # Verify the password in the hashing pool while the organization lookup is in flight
     org_id = admin.get("organization_id")
+    verify_task = verify_password_async(payload.password, admin["password_hash"])
+    if org_id:
+        password_ok, org = await asyncio.gather(
+            verify_task,
+            orgs_coll.find_one({"_id": org_id}, projection={"name": 1}),
+        )
+    else:
+        password_ok, org = await verify_task, None
+
+    if not password_ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+
     if not org_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Admin is not associated with any organization")
 
-    org = await orgs_coll.find_one({"_id": ObjectId(org_id)})
     if not org:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Organization not found for admin")
 
     token_data = {
         "sub": str(admin["_id"]),
-        "org_id": str(org["_id"]),
+        "org_id": str(org_id),
         "org_name": org["name"],
     }
     access_token = create_access_token(token_data)
@@ -1,9 +1,10 @@
-from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 
 from ..auth import get_current_admin
-from ..db import get_database
+from ..db import get_admins_collection, get_orgs_collection
 from ..models import (
+    ORG_PROJECTION,
     create_organization_with_admin,
     delete_organization_and_admin,
     get_org_by_name,
@@ -16,16 +17,45 @@ from ..schemas import (
     OrganizationResponse,
     OrganizationUpdate,
 )
+from .body import json_body_openapi, parse_json_body
 
 
 router = APIRouter(prefix="/org", tags=["organizations"])
 
+_CREATE_ADAPTER = TypeAdapter(OrganizationCreate)
+_UPDATE_ADAPTER = TypeAdapter(OrganizationUpdate)
+_DELETE_ADAPTER = TypeAdapter(OrganizationDelete)
 
-@router.post("/create", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
-async def create_organization(payload: OrganizationCreate):
+
+def _org_response(org_doc: dict) -> dict:
+    # Dict in the OrganizationResponse shape; the route's response_model validates and serializes it
+    return {
+        # Documents created before id_str was stored fall back to converting _id
+        "id": org_doc.get("id_str") or str(org_doc["_id"]),
+        "organization_name": org_doc["name"],
+        "collection_name": org_doc["collection_name"],
+        "created_at": org_doc["created_at"],
+        "updated_at": org_doc["updated_at"],
+    }
+
+
+@router.post(
+    "/create",
+    response_model=OrganizationResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=json_body_openapi(OrganizationCreate),
+)
+async def create_organization(
+    request: Request,
+    orgs_coll=Depends(get_orgs_collection),
+    admins_coll=Depends(get_admins_collection),
+):
     """Create a new organization and its admin, along with a dynamic collection."""
+    payload = await parse_json_body(request, _CREATE_ADAPTER)
     try:
         org_doc = await create_organization_with_admin(
+            orgs=orgs_coll,
+            admins=admins_coll,
             organization_name=payload.organization_name,
             email=payload.email,
             password=payload.password,
@@ -33,51 +63,48 @@ async def create_organization(payload: OrganizationCreate):
     except ValueError as exc:  # organization already exists
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    return OrganizationResponse(
-        id=str(org_doc["_id"]),
-        organization_name=org_doc["name"],
-        collection_name=org_doc["collection_name"],
-        created_at=org_doc["created_at"],
-        updated_at=org_doc["updated_at"],
-    )
+    return _org_response(org_doc)
 
 
 @router.get("/get", response_model=OrganizationResponse)
-async def get_organization(organization_name: str):
+async def get_organization(organization_name: str, orgs_coll=Depends(get_orgs_collection)):
     """Get organization metadata by name."""
-    org_doc = await get_org_by_name(organization_name)
+    org_doc = await get_org_by_name(orgs_coll, organization_name)
     if not org_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
 
-    return OrganizationResponse(
-        id=str(org_doc["_id"]),
-        organization_name=org_doc["name"],
-        collection_name=org_doc["collection_name"],
-        created_at=org_doc["created_at"],
-        updated_at=org_doc["updated_at"],
-    )
+    return _org_response(org_doc)
 
 
-@router.put("/update", response_model=OrganizationResponse)
+@router.put(
+    "/update",
+    response_model=OrganizationResponse,
+    openapi_extra=json_body_openapi(OrganizationUpdate),
+)
 async def update_organization(
-    payload: OrganizationUpdate,
+    request: Request,
     current_admin=Depends(get_current_admin),
+    orgs_coll=Depends(get_orgs_collection),
+    admins_coll=Depends(get_admins_collection),
 ):
     """Update organization name (with collection migration) and/or admin credentials.
 
     The assignment spec lists organization_name, email, password as inputs. Here we treat
     organization_name as the *new* organization name for the authenticated admin's organization.
     """
+    payload = await parse_json_body(request, _UPDATE_ADAPTER)
 
-    db = await get_database()
-    orgs_coll = db["organizations"]
-
-    org_doc = await orgs_coll.find_one({"_id": ObjectId(current_admin.organization_id)})
+    org_doc = await orgs_coll.find_one(
+        {"_id": current_admin.organization_oid},
+        projection=ORG_PROJECTION,
+    )
     if not org_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
 
     try:
         updated_org = await update_organization_and_admin(
+            orgs=orgs_coll,
+            admins=admins_coll,
             current_org=org_doc,
             new_org_name=payload.organization_name,
             new_email=payload.email,
@@ -86,30 +113,27 @@ async def update_organization(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    return OrganizationResponse(
-        id=str(updated_org["_id"]),
-        organization_name=updated_org["name"],
-        collection_name=updated_org["collection_name"],
-        created_at=updated_org["created_at"],
-        updated_at=updated_org["updated_at"],
-    )
+    return _org_response(updated_org)
 
 
-@router.delete("/delete", response_model=Message)
+@router.delete("/delete", response_model=Message, openapi_extra=json_body_openapi(OrganizationDelete))
 async def delete_organization(
-    payload: OrganizationDelete,
+    request: Request,
     current_admin=Depends(get_current_admin),
+    orgs_coll=Depends(get_orgs_collection),
+    admins_coll=Depends(get_admins_collection),
 ):
     """Delete the authenticated admin's organization and its dynamic collection.
 
     Only allows deletion of the organization that matches the authenticated admin and
     the provided organization_name.
     """
+    payload = await parse_json_body(request, _DELETE_ADAPTER)
 
-    db = await get_database()
-    orgs_coll = db["organizations"]
-
-    org_doc = await orgs_coll.find_one({"_id": ObjectId(current_admin.organization_id)})
+    org_doc = await orgs_coll.find_one(
+        {"_id": current_admin.organization_oid},
+        projection={"name": 1, "slug": 1, "collection_name": 1, "admin_id": 1},
+    )
     if not org_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
 
@@ -119,5 +143,5 @@ async def delete_organization(
             detail="You can only delete your own organization with matching name.",
         )
 
-    await delete_organization_and_admin(org_doc)
+    await delete_organization_and_admin(orgs_coll, admins_coll, org_doc)
     return Message(message="Organization deleted successfully")
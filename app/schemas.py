@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class OrganizationBase(BaseModel):
@@ -47,9 +48,14 @@ class TokenResponse(BaseModel):
 
 
 class AdminInToken(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     admin_id: str
     organization_id: str
     organization_name: str
+    # Parsed once from the token so handlers don't rebuild them per query
+    admin_oid: ObjectId
+    organization_oid: ObjectId
 
 
 class Message(BaseModel):